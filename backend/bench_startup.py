@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the API process
+Run with: python bench_startup.py [runs]
+
+Each run spawns a fresh interpreter so module caches don't skew the numbers,
+then reports import time for `main` and time until `/ready` would pass. With
+SCREENER_REFRESH set, ready includes the first screener quote pass.
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+
+async def boot():
+    async with main.lifespan(main.app):
+        while not main.is_ready():
+            await asyncio.sleep(0.001)
+        return time.perf_counter()
+
+t2 = asyncio.run(boot())
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "ready_ms": (t2 - t0) * 1000}))
+"""
+
+
+def run_once() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    samples = [run_once() for _ in range(runs)]
+
+    print(f"⏱  Cold start over {runs} runs")
+    for key in ("import_ms", "ready_ms"):
+        values = [s[key] for s in samples]
+        print(
+            f"   {key:<10} median {statistics.median(values):7.1f}  "
+            f"min {min(values):7.1f}  max {max(values):7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
 from typing import List
 
 from dotenv import load_dotenv
@@ -9,15 +10,55 @@ load_dotenv()
 
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-
-from enrich import enrich_ticker
-from scheduler import start_scheduler
+from fastapi.responses import JSONResponse
+
+from scheduler import APP_ROLE, APP_ROLES, scheduler_enabled, start_scheduler
+from screener import (
+    SCREENER_REFRESH,
+    SCREENER_UNIVERSE,
+    router as screener_router,
+    run_refresh_loop,
+    screener_status,
+)
 from trades import router as trades_router
 
+# Only the screener deployment has anything to load before serving
+SCREENER_LOADING = SCREENER_REFRESH and bool(SCREENER_UNIVERSE)
+
+
+def is_ready() -> bool:
+    """API pods are ready once started; the screener deployment once its
+    first quote pass over the universe has been written."""
+    return not SCREENER_LOADING or screener_status()["loaded"]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if APP_ROLE not in APP_ROLES or APP_ROLE == "worker":
+        raise RuntimeError(
+            f"APP_ROLE={APP_ROLE!r} can't serve HTTP; use 'api' or 'all' "
+            "(run the worker with `python scheduler.py`)"
+        )
+
+    app.state.scheduler = start_scheduler() if scheduler_enabled() else None
+
+    screener_task = None
+    if SCREENER_LOADING:
+        screener_task = asyncio.create_task(run_refresh_loop())
+
+    yield
+
+    if screener_task is not None:
+        screener_task.cancel()
+    if app.state.scheduler is not None:
+        app.state.scheduler.shutdown(wait=False)
+
+
 app = FastAPI(
     title="Trading Journal API",
     description="API for managing trades and market analysis",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -31,8 +72,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(trades_router)
-
-scheduler = start_scheduler()
+app.include_router(screener_router)
 
 @app.get("/")
 async def root():
@@ -42,9 +82,25 @@ async def root():
 async def health_check():
     return {"status": "healthy", "message": "API is running successfully"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 while the screener universe is still loading"""
+    if not is_ready():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "loading", "screener": screener_status()},
+        )
+    return {
+        "status": "ready",
+        "scheduler": app.state.scheduler is not None,
+        "screener": screener_status() if SCREENER_REFRESH else None,
+    }
+
 @app.get("/enrich/{ticker}")
 async def enrich_ticker_endpoint(ticker: str):
     """Get enriched market data for any ticker symbol"""
+    from enrich import enrich_ticker
+
     try:
         enriched_data = await enrich_ticker(ticker.upper())
         return enriched_data
@@ -64,6 +120,8 @@ async def analyze_tickers(
     - Risk assessment
     - Recent news headlines
     """
+    from enrich import enrich_ticker
+
     ticker_list = [t.strip().upper() for t in tickers.split(",") if t.strip()]
     
     if not ticker_list:
@@ -3,31 +3,68 @@ from __future__ import annotations
 import os
 import asyncio
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, List
 
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
+from dotenv import load_dotenv
 
-from enrich import enrich_ticker
+load_dotenv()
 
-WATCHLIST = os.getenv("WATCHLIST", "").split(",")  # e.g. "AMC,GME,SNAP"
+if TYPE_CHECKING:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+WATCHLIST = [t.strip().upper() for t in os.getenv("WATCHLIST", "").split(",") if t.strip()]  # e.g. "AMC,GME,SNAP"
 CACHE: dict[str, dict] = {}
 
+# Process role: "api" serves HTTP only, "worker" is the standalone
+# `python scheduler.py` process, "all" runs the scheduler inside the API
+# process too (handy for local dev).
+APP_ROLE = os.getenv("APP_ROLE", "api").lower()
+APP_ROLES = ("api", "worker", "all")
+
+
+def scheduler_enabled(role: str = APP_ROLE) -> bool:
+    """Whether the API process should run the cron job alongside HTTP."""
+    return role == "all"
+
 
 async def refresh_watchlist() -> None:
     if not WATCHLIST:
         return
 
+    # Imported lazily so API processes don't pay for it at startup
+    from enrich import enrich_ticker
+
     print(f"[{datetime.utcnow().isoformat()}] Refreshing {len(WATCHLIST)} tickers")
-    results = await asyncio.gather(*(enrich_ticker(t) for t in WATCHLIST))
+    results = await asyncio.gather(
+        *(enrich_ticker(t) for t in WATCHLIST), return_exceptions=True
+    )
     for res in results:
+        if isinstance(res, Exception):
+            print(f"Error refreshing ticker: {res}")
+            continue
         CACHE[res["ticker"]] = res
     print("Cache updated")
 
 
 def start_scheduler() -> AsyncIOScheduler:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.cron import CronTrigger
+
     scheduler = AsyncIOScheduler(timezone="US/Eastern")
     # Run daily at 08:00 ET
     scheduler.add_job(refresh_watchlist, CronTrigger(hour=8, minute=0))
     scheduler.start()
-    return scheduler 
\ No newline at end of file
+    return scheduler
+
+
+async def run_worker() -> None:
+    """Standalone worker entrypoint: run the scheduler until cancelled."""
+    scheduler = start_scheduler()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        scheduler.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
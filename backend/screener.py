@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+import time
+
+from fastapi import APIRouter, HTTPException, Query
+
+router = APIRouter(prefix="/screener", tags=["screener"])
+
+# Symbols to keep snapshots for, e.g. "AMC,GME,SNAP,..." (thousands is fine)
+SCREENER_UNIVERSE = [
+    t.strip().upper() for t in os.getenv("SCREENER_UNIVERSE", "").split(",") if t.strip()
+]
+
+# Opt-in: each process that refreshes polls Finnhub for the whole universe,
+# so enable it on one dedicated screener deployment, not every API pod
+SCREENER_REFRESH = os.getenv("SCREENER_REFRESH", "").lower() in ("1", "true", "yes")
+
+
+def screener_status() -> dict:
+    """How much of the universe this process has loaded, for /ready."""
+    from universe import UNIVERSE
+
+    return UNIVERSE.status()
+
+
+async def run_refresh_loop() -> None:
+    # NumPy is only pulled in once the screener is actually used
+    from universe import run_refresh_loop as _run
+
+    await _run(SCREENER_UNIVERSE)
+
+
+# ------------------------------------------------------------
+# Endpoints
+# ------------------------------------------------------------
+@router.get("")
+async def get_screener(
+    filters: str = Query(
+        "",
+        description="Comma-separated clauses, e.g. gap_pct>=5,float_shares<=20,price<=20,risk<=Medium",
+    ),
+    sort: str = Query("gap_pct", description="Field to sort by"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    Screen the symbol universe for pre-market movers.
+
+    Fields: price, prev_close, volume, avg_volume_10d, float_shares (millions),
+    market_cap (millions), dilution_pct_float, risk, gap_pct, rel_volume.
+
+    volume and rel_volume are always null for now (Finnhub /quote carries no
+    volume), so filtering or sorting on them returns 400. Symbols with an
+    unknown float, market cap or risk never match filters on those fields.
+
+    Only processes running with SCREENER_REFRESH hold the universe; any other
+    process answers 503 so the request can be routed to the screener
+    deployment instead of returning an empty result.
+    """
+    if not SCREENER_REFRESH:
+        raise HTTPException(
+            status_code=503,
+            detail="Screener is not served by this process; route /screener to the SCREENER_REFRESH deployment",
+        )
+
+    from universe import UNIVERSE, check_field, parse_filters, screen
+
+    try:
+        check_field(sort)
+        clauses = parse_filters(filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    started = time.perf_counter()
+    results = screen(UNIVERSE, clauses, sort=sort, descending=order == "desc", limit=limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        "universe_size": len(UNIVERSE),
+        "count": len(results),
+        "elapsed_ms": round(elapsed_ms, 3),
+        "results": results,
+    }
@@ -0,0 +1,233 @@
+-- Migration for Trade Rollups
+-- Per-user performance aggregated by tag, setup, symbol and day, kept current
+-- incrementally by triggers so dashboards never scan the full trades table.
+
+-- Create trade_rollups table
+CREATE TABLE IF NOT EXISTS trade_rollups (
+    user_id UUID NOT NULL,
+    dimension VARCHAR(10) NOT NULL CHECK (dimension IN ('tag', 'setup', 'symbol', 'day')),
+    -- tag id, setup text, symbol or ISO date depending on dimension
+    key TEXT NOT NULL,
+    trade_count INTEGER NOT NULL DEFAULT 0,
+    winning_trades INTEGER NOT NULL DEFAULT 0,
+    losing_trades INTEGER NOT NULL DEFAULT 0,
+    total_pnl NUMERIC(20, 8) NOT NULL DEFAULT 0,
+    gross_profit NUMERIC(20, 8) NOT NULL DEFAULT 0,
+    gross_loss NUMERIC(20, 8) NOT NULL DEFAULT 0,
+    -- R multiple only exists for trades with a stop loss
+    r_trades INTEGER NOT NULL DEFAULT 0,
+    total_r NUMERIC(20, 8) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, dimension, key)
+);
+
+-- Enable RLS
+ALTER TABLE trade_rollups ENABLE ROW LEVEL SECURITY;
+
+-- Rollups are written only by the triggers below, so users get read access only
+DROP POLICY IF EXISTS "Users can view their own trade rollups" ON trade_rollups;
+CREATE POLICY "Users can view their own trade rollups"
+    ON trade_rollups FOR SELECT
+    USING (auth.uid() = user_id);
+
+-- Create indexes
+CREATE INDEX IF NOT EXISTS trade_rollups_user_dimension_pnl_idx
+    ON trade_rollups(user_id, dimension, total_pnl DESC);
+-- Needed by the ON DELETE CASCADE from tags
+CREATE INDEX IF NOT EXISTS trade_tags_tag_id_idx ON trade_tags(tag_id);
+
+-- Triggers and backfill go in one transaction so no write lands between
+-- clearing and rebuilding the rollups
+BEGIN;
+
+LOCK TABLE trades, trade_tags IN SHARE ROW EXCLUSIVE MODE;
+
+-- R multiple: net P&L divided by the dollar risk to the stop
+CREATE OR REPLACE FUNCTION trade_r_multiple(t trades)
+RETURNS NUMERIC AS $$
+BEGIN
+    IF t.stop_loss IS NULL OR t.entry_price = t.stop_loss OR t.quantity = 0 THEN
+        RETURN NULL;
+    END IF;
+    RETURN t.net_pnl / (ABS(t.entry_price - t.stop_loss) * t.quantity);
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- Add (sign = 1) or remove (sign = -1) one trade from a single rollup row
+CREATE OR REPLACE FUNCTION apply_trade_rollup(
+    t trades, p_dimension TEXT, p_key TEXT, sign INTEGER
+)
+RETURNS VOID AS $$
+DECLARE
+    r NUMERIC := trade_r_multiple(t);
+BEGIN
+    IF p_key IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO trade_rollups AS tr (
+        user_id, dimension, key, trade_count, winning_trades, losing_trades,
+        total_pnl, gross_profit, gross_loss, r_trades, total_r, updated_at
+    )
+    VALUES (
+        t.user_id, p_dimension, p_key,
+        sign,
+        CASE WHEN t.net_pnl > 0 THEN sign ELSE 0 END,
+        CASE WHEN t.net_pnl < 0 THEN sign ELSE 0 END,
+        sign * t.net_pnl,
+        CASE WHEN t.net_pnl > 0 THEN sign * t.net_pnl ELSE 0 END,
+        CASE WHEN t.net_pnl < 0 THEN sign * -t.net_pnl ELSE 0 END,
+        CASE WHEN r IS NOT NULL THEN sign ELSE 0 END,
+        sign * COALESCE(r, 0),
+        NOW()
+    )
+    ON CONFLICT (user_id, dimension, key) DO UPDATE SET
+        trade_count = tr.trade_count + EXCLUDED.trade_count,
+        winning_trades = tr.winning_trades + EXCLUDED.winning_trades,
+        losing_trades = tr.losing_trades + EXCLUDED.losing_trades,
+        total_pnl = tr.total_pnl + EXCLUDED.total_pnl,
+        gross_profit = tr.gross_profit + EXCLUDED.gross_profit,
+        gross_loss = tr.gross_loss + EXCLUDED.gross_loss,
+        r_trades = tr.r_trades + EXCLUDED.r_trades,
+        total_r = tr.total_r + EXCLUDED.total_r,
+        updated_at = NOW();
+
+    DELETE FROM trade_rollups
+    WHERE user_id = t.user_id
+      AND dimension = p_dimension
+      AND key = p_key
+      AND trade_count <= 0;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Apply a trade to every rollup it belongs to; tags are included when asked
+CREATE OR REPLACE FUNCTION apply_trade_rollups(t trades, sign INTEGER, with_tags BOOLEAN)
+RETURNS VOID AS $$
+DECLARE
+    tag_key UUID;
+BEGIN
+    PERFORM apply_trade_rollup(t, 'setup', NULLIF(TRIM(t.setup), ''), sign);
+    PERFORM apply_trade_rollup(t, 'symbol', t.symbol, sign);
+    PERFORM apply_trade_rollup(t, 'day', t.date::TEXT, sign);
+
+    IF with_tags THEN
+        FOR tag_key IN SELECT tag_id FROM trade_tags WHERE trade_id = t.id LOOP
+            PERFORM apply_trade_rollup(t, 'tag', tag_key::TEXT, sign);
+        END LOOP;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- The helpers take a whole trades row, so calling them directly (e.g. via
+-- PostgREST /rpc) could forge another user's rollups. Only the trigger
+-- functions below, running as the owner, may use them.
+REVOKE EXECUTE ON FUNCTION trade_r_multiple(trades) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION apply_trade_rollup(trades, TEXT, TEXT, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION apply_trade_rollups(trades, INTEGER, BOOLEAN) FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION trades_rollup_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        -- New trades have no tags yet; trade_tags inserts add those
+        PERFORM apply_trade_rollups(NEW, 1, FALSE);
+        RETURN NEW;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Notes/screenshot edits don't move any rollup
+        IF (OLD.user_id, OLD.net_pnl, OLD.setup, OLD.symbol, OLD.date,
+            OLD.entry_price, OLD.stop_loss, OLD.quantity)
+           IS NOT DISTINCT FROM
+           (NEW.user_id, NEW.net_pnl, NEW.setup, NEW.symbol, NEW.date,
+            NEW.entry_price, NEW.stop_loss, NEW.quantity) THEN
+            RETURN NEW;
+        END IF;
+        PERFORM apply_trade_rollups(OLD, -1, TRUE);
+        PERFORM apply_trade_rollups(NEW, 1, TRUE);
+        RETURN NEW;
+    ELSE
+        -- Runs BEFORE DELETE so trade_tags rows are still there to subtract
+        PERFORM apply_trade_rollups(OLD, -1, TRUE);
+        RETURN OLD;
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION trade_tags_rollup_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    t trades;
+BEGIN
+    -- UPDATE (clients may re-point tag_id/trade_id) is a delete plus an insert
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        -- A missing trade means this is the ON DELETE CASCADE from trades,
+        -- which the trades trigger has already subtracted
+        SELECT * INTO t FROM trades WHERE id = OLD.trade_id;
+        IF FOUND THEN
+            PERFORM apply_trade_rollup(t, 'tag', OLD.tag_id::TEXT, -1);
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT * INTO t FROM trades WHERE id = NEW.trade_id;
+        IF FOUND THEN
+            PERFORM apply_trade_rollup(t, 'tag', NEW.tag_id::TEXT, 1);
+        END IF;
+        RETURN NEW;
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Create rollup triggers
+DROP TRIGGER IF EXISTS trades_rollup_after_write ON trades;
+CREATE TRIGGER trades_rollup_after_write
+    AFTER INSERT OR UPDATE ON trades
+    FOR EACH ROW
+    EXECUTE FUNCTION trades_rollup_trigger();
+
+DROP TRIGGER IF EXISTS trades_rollup_before_delete ON trades;
+CREATE TRIGGER trades_rollup_before_delete
+    BEFORE DELETE ON trades
+    FOR EACH ROW
+    EXECUTE FUNCTION trades_rollup_trigger();
+
+DROP TRIGGER IF EXISTS trade_tags_rollup ON trade_tags;
+CREATE TRIGGER trade_tags_rollup
+    AFTER INSERT OR UPDATE OR DELETE ON trade_tags
+    FOR EACH ROW
+    EXECUTE FUNCTION trade_tags_rollup_trigger();
+
+-- Backfill from existing trades (rebuilds from scratch, safe to re-run)
+DELETE FROM trade_rollups;
+INSERT INTO trade_rollups (
+    user_id, dimension, key, trade_count, winning_trades, losing_trades,
+    total_pnl, gross_profit, gross_loss, r_trades, total_r
+)
+SELECT
+    user_id, dimension, key,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE net_pnl > 0),
+    COUNT(*) FILTER (WHERE net_pnl < 0),
+    SUM(net_pnl),
+    COALESCE(SUM(net_pnl) FILTER (WHERE net_pnl > 0), 0),
+    COALESCE(-SUM(net_pnl) FILTER (WHERE net_pnl < 0), 0),
+    COUNT(r),
+    COALESCE(SUM(r), 0)
+FROM (
+    SELECT t.user_id, d.dimension, d.key, t.net_pnl, trade_r_multiple(t) AS r
+    FROM trades t
+    CROSS JOIN LATERAL (
+        VALUES
+            ('setup', NULLIF(TRIM(t.setup), '')),
+            ('symbol', t.symbol::TEXT),
+            ('day', t.date::TEXT)
+    ) AS d(dimension, key)
+    UNION ALL
+    SELECT t.user_id, 'tag', tt.tag_id::TEXT, t.net_pnl, trade_r_multiple(t)
+    FROM trades t
+    JOIN trade_tags tt ON tt.trade_id = t.id
+) AS facts
+WHERE key IS NOT NULL
+GROUP BY user_id, dimension, key;
+
+COMMIT;
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from typing import List, Optional
-from datetime import datetime, date
+from typing import Dict, Iterator, List, Optional, Tuple
+import datetime as dt
+from datetime import datetime
 from pydantic import BaseModel
 from fastapi import APIRouter, HTTPException
 from enum import Enum
-from enrich import enrich_ticker
 
 router = APIRouter(prefix="/trades", tags=["trades"])
 
@@ -27,9 +27,10 @@ class TradeCreate(BaseModel):
     sector_momentum: Optional[str] = None
     stop_loss: Optional[float] = None
     target: Optional[float] = None
-    date: Optional[date] = None
+    date: Optional[dt.date] = None
     entry_time: Optional[datetime] = None
     exit_time: Optional[datetime] = None
+    tags: List[str] = []
 
 class Trade(TradeCreate):
     id: str
@@ -54,10 +55,77 @@ class TradeStats(BaseModel):
     avg_loss: float
     profit_factor: float
 
+class TradeRollup(BaseModel):
+    key: str
+    trade_count: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float
+    total_pnl: float
+    avg_pnl: float
+    avg_r: Optional[float] = None
+
 # In-memory storage for demo purposes
 # In production, this would connect to your database
 trades_db: List[Trade] = []
 
+# Per-user rollups: (user_id, dimension) -> key -> running totals. Updated on
+# every write so the by-* stats never scan trades_db. Mirrors trade_rollups.
+rollups_db: Dict[Tuple[str, str], Dict[str, Dict[str, float]]] = {}
+
+def _r_multiple(trade: Trade) -> Optional[float]:
+    """Net P&L divided by the dollar risk to the stop"""
+    if trade.stop_loss is None or trade.entry_price == trade.stop_loss or not trade.quantity:
+        return None
+    return trade.net_pnl / (abs(trade.entry_price - trade.stop_loss) * trade.quantity)
+
+def _rollup_keys(trade: Trade) -> Iterator[Tuple[str, str]]:
+    if trade.setup and trade.setup.strip():
+        yield "setup", trade.setup.strip()
+    yield "symbol", trade.symbol
+    yield "day", (trade.date or trade.created_at.date()).isoformat()
+    # Like trade_tags' (trade_id, tag_id) key: each tag counts once per trade
+    for tag in dict.fromkeys(t.strip() for t in trade.tags):
+        if tag:
+            yield "tag", tag
+
+def _apply_rollups(trade: Trade, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) a trade from all its rollups"""
+    r = _r_multiple(trade)
+    for dimension, key in _rollup_keys(trade):
+        bucket = rollups_db.setdefault((trade.user_id, dimension), {})
+        acc = bucket.setdefault(key, {
+            "trade_count": 0, "winning_trades": 0, "losing_trades": 0,
+            "total_pnl": 0.0, "r_trades": 0, "total_r": 0.0,
+        })
+        acc["trade_count"] += sign
+        acc["winning_trades"] += sign if trade.net_pnl > 0 else 0
+        acc["losing_trades"] += sign if trade.net_pnl < 0 else 0
+        acc["total_pnl"] += sign * trade.net_pnl
+        if r is not None:
+            acc["r_trades"] += sign
+            acc["total_r"] += sign * r
+        if acc["trade_count"] <= 0:
+            del bucket[key]
+
+def _rollups_for(user_id: str, dimension: str) -> List[TradeRollup]:
+    results = []
+    for key, acc in rollups_db.get((user_id, dimension), {}).items():
+        count = acc["trade_count"]
+        results.append(TradeRollup(
+            key=key,
+            trade_count=count,
+            winning_trades=acc["winning_trades"],
+            losing_trades=acc["losing_trades"],
+            win_rate=acc["winning_trades"] / count * 100,
+            total_pnl=acc["total_pnl"],
+            avg_pnl=acc["total_pnl"] / count,
+            avg_r=acc["total_r"] / acc["r_trades"] if acc["r_trades"] else None,
+        ))
+    if dimension == "day":
+        return sorted(results, key=lambda r: r.key, reverse=True)
+    return sorted(results, key=lambda r: r.total_pnl, reverse=True)
+
 @router.post("/", response_model=Trade)
 async def create_trade(trade_data: TradeCreate):
     """Create a new trade"""
@@ -87,6 +155,7 @@ async def create_trade(trade_data: TradeCreate):
     )
     
     trades_db.append(trade)
+    _apply_rollups(trade, 1)
     return trade
 
 @router.get("/", response_model=List[Trade])
@@ -112,13 +181,15 @@ async def update_trade(trade_id: str, trade_data: TradeCreate):
             net_pnl = gross_pnl - trade_data.commission
             
             # Update trade
-            updated_trade = Trade(
-                **trade.model_dump(exclude={"created_at"}),
+            updated_trade = Trade(**{
+                **trade.model_dump(),
                 **trade_data.model_dump(),
-                gross_pnl=gross_pnl,
-                net_pnl=net_pnl,
-                updated_at=datetime.now()
-            )
+                "gross_pnl": gross_pnl,
+                "net_pnl": net_pnl,
+                "updated_at": datetime.now(),
+            })
+            _apply_rollups(trade, -1)
+            _apply_rollups(updated_trade, 1)
             trades_db[i] = updated_trade
             return updated_trade
     
@@ -130,6 +201,7 @@ async def delete_trade(trade_id: str):
     for i, trade in enumerate(trades_db):
         if trade.id == trade_id:
             trades_db.pop(i)
+            _apply_rollups(trade, -1)
             return {"message": "Trade deleted successfully"}
     raise HTTPException(status_code=404, detail="Trade not found")
 
@@ -197,6 +269,26 @@ async def get_trade_stats():
         profit_factor=profit_factor
     )
 
+@router.get("/stats/by-tag", response_model=List[TradeRollup])
+async def get_stats_by_tag():
+    """Get performance per tag, best total P&L first"""
+    return _rollups_for("demo_user", "tag")
+
+@router.get("/stats/by-setup", response_model=List[TradeRollup])
+async def get_stats_by_setup():
+    """Get performance per setup, best total P&L first"""
+    return _rollups_for("demo_user", "setup")
+
+@router.get("/stats/by-symbol", response_model=List[TradeRollup])
+async def get_stats_by_symbol():
+    """Get performance per symbol, best total P&L first"""
+    return _rollups_for("demo_user", "symbol")
+
+@router.get("/stats/by-day", response_model=List[TradeRollup])
+async def get_stats_by_day():
+    """Get performance per trading day, most recent first"""
+    return _rollups_for("demo_user", "day")
+
 @router.get("/{trade_id}/analysis")
 async def get_trade_analysis(trade_id: str):
     """Get detailed analysis for a specific trade including current market data"""
@@ -212,6 +304,8 @@ async def get_trade_analysis(trade_id: str):
         raise HTTPException(status_code=404, detail="Trade not found")
     
     # Get current market analysis using existing enrich service
+    from enrich import enrich_ticker
+
     try:
         market_data = await enrich_ticker(trade.symbol)
         
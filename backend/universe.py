@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import asyncio
+import operator
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+QUOTE_REFRESH_SECONDS = float(os.getenv("SCREENER_QUOTE_REFRESH_SECONDS", "60"))
+METRICS_TTL_SECONDS = float(os.getenv("SCREENER_METRICS_TTL_SECONDS", "21600"))
+METRICS_RETRY_SECONDS = float(os.getenv("SCREENER_METRICS_RETRY_SECONDS", "900"))
+METRICS_BATCH_SIZE = int(os.getenv("SCREENER_METRICS_BATCH_SIZE", "100"))
+MAX_CONCURRENCY = int(os.getenv("SCREENER_MAX_CONCURRENCY", "20"))
+# Request budgets per provider; defaults match the Finnhub free tier, raise
+# them to your plan's limit or a large universe takes minutes per pass
+FINNHUB_RATE_PER_MINUTE = float(os.getenv("SCREENER_FINNHUB_RATE_PER_MINUTE", "60"))
+SEC_RATE_PER_MINUTE = float(os.getenv("SCREENER_SEC_RATE_PER_MINUTE", "20"))
+
+# Ordered so range filters make sense, e.g. "risk<=Medium". "Unknown" is
+# stored as NaN so it never satisfies a comparison.
+RISK_CODES = {"Low": 1, "Medium": 2, "High": 3}
+RISK_NAMES = {v: k for k, v in RISK_CODES.items()}
+
+OPERATORS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "!=": operator.ne,
+    "==": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+# Raw columns stored per symbol; everything is float64 with NaN for "unknown"
+COLUMNS = (
+    "price",
+    "prev_close",
+    "volume",
+    "avg_volume_10d",
+    "float_shares",
+    "market_cap",
+    "dilution_pct_float",
+    "risk",
+    "quote_ts",
+    "metrics_ts",
+)
+# Derived columns computed on demand from the raw ones
+DERIVED = ("gap_pct", "rel_volume")
+FIELDS = COLUMNS[:-2] + DERIVED
+# Finnhub /quote carries no volume, so these stay NaN until a volume source
+# exists; filtering or sorting on them is rejected rather than matching nothing
+UNAVAILABLE = ("volume", "rel_volume")
+
+
+class Universe:
+    """Columnar snapshot store: one NumPy array per field, one row per symbol."""
+
+    def __init__(self, capacity: int = 1024):
+        self.symbols: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.data: Dict[str, np.ndarray] = {
+            col: np.full(capacity, np.nan) for col in COLUMNS
+        }
+        # Set once the first full quote pass has been written
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _row(self, symbol: str) -> int:
+        row = self.index.get(symbol)
+        if row is not None:
+            return row
+
+        row = len(self.symbols)
+        capacity = len(self.data["price"])
+        if row >= capacity:
+            for col, arr in self.data.items():
+                grown = np.full(capacity * 2, np.nan)
+                grown[:capacity] = arr
+                self.data[col] = grown
+        self.symbols.append(symbol)
+        self.index[symbol] = row
+        return row
+
+    def rows(self, symbols: List[str]) -> np.ndarray:
+        return np.fromiter((self._row(s) for s in symbols), dtype=np.intp, count=len(symbols))
+
+    def update_quotes(
+        self,
+        symbols: List[str],
+        price: np.ndarray,
+        prev_close: np.ndarray,
+        volume: np.ndarray,
+    ) -> None:
+        """Write a batch of quotes in one vectorized assignment per column."""
+        rows = self.rows(symbols)
+        self.data["price"][rows] = price
+        self.data["prev_close"][rows] = prev_close
+        self.data["volume"][rows] = volume
+        self.data["quote_ts"][rows] = time.time()
+
+    def update_metrics(self, symbol: str, snapshot: Dict[str, Any]) -> None:
+        """Store slow-moving fields from an `enrich_ticker`-shaped dict."""
+        row = self._row(symbol)
+        # Finnhub reports 0 when a company has no profile/metric data
+        for col in ("avg_volume_10d", "float_shares", "market_cap"):
+            value = snapshot.get(col)
+            self.data[col][row] = float(value) if value and value > 0 else np.nan
+
+        # A None dilution means 0% when the float is known, unknown otherwise
+        dilution = snapshot.get("dilution_pct_float")
+        if dilution is None and not np.isnan(self.data["float_shares"][row]):
+            dilution = 0.0
+        self.data["dilution_pct_float"][row] = np.nan if dilution is None else float(dilution)
+
+        self.data["risk"][row] = RISK_CODES.get(snapshot.get("risk"), np.nan)
+        self.data["metrics_ts"][row] = time.time()
+
+    def metrics_failed(self, symbols: List[str]) -> None:
+        """Back off failed symbols so they retry after METRICS_RETRY_SECONDS."""
+        rows = self.rows(symbols)
+        self.data["metrics_ts"][rows] = time.time() - METRICS_TTL_SECONDS + METRICS_RETRY_SECONDS
+
+    def stale_metrics(self, ttl: float = METRICS_TTL_SECONDS, limit: int | None = None) -> List[str]:
+        n = len(self)
+        ts = self.data["metrics_ts"][:n]
+        stale = np.flatnonzero(np.isnan(ts) | (ts < time.time() - ttl))
+        return [self.symbols[i] for i in stale[:limit]]
+
+    def status(self) -> Dict[str, int]:
+        n = len(self)
+        return {
+            "symbols": n,
+            "quotes": int(np.count_nonzero(~np.isnan(self.data["quote_ts"][:n]))),
+            "metrics": int(np.count_nonzero(~np.isnan(self.data["metrics_ts"][:n]))),
+            "loaded": self.loaded,
+        }
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Views of the populated rows plus the derived columns."""
+        n = len(self)
+        cols = {col: arr[:n] for col, arr in self.data.items()}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            prev = cols["prev_close"]
+            cols["gap_pct"] = np.where(
+                prev > 0, (cols["price"] - prev) / prev * 100, np.nan
+            )
+            # Finnhub reports 10DayAverageTradingVolume in millions of shares
+            avg = cols["avg_volume_10d"] * 1e6
+            cols["rel_volume"] = np.where(avg > 0, cols["volume"] / avg, np.nan)
+        return cols
+
+
+def parse_filters(expr: str) -> List[tuple[str, str, float]]:
+    """Parse "gap_pct>=5,float_shares<=20,risk<=Medium" into (field, op, value)."""
+    clauses = []
+    for raw in expr.split(","):
+        clause = raw.replace(" ", "")
+        if not clause:
+            continue
+        for op in OPERATORS:
+            field, sep, value = clause.partition(op)
+            if sep:
+                break
+        else:
+            raise ValueError(f"Missing operator in filter '{raw.strip()}'")
+
+        check_field(field)
+        if field == "risk":
+            if value not in RISK_CODES:
+                raise ValueError(f"Unknown risk level '{value}'")
+            clauses.append((field, op, float(RISK_CODES[value])))
+            continue
+        try:
+            clauses.append((field, op, float(value)))
+        except ValueError:
+            raise ValueError(f"Invalid number '{value}' in filter '{raw.strip()}'")
+    return clauses
+
+
+def check_field(field: str) -> None:
+    if field not in FIELDS:
+        raise ValueError(f"Unknown field '{field}'")
+    if field in UNAVAILABLE:
+        raise ValueError(f"'{field}' is not available yet: no volume source")
+
+
+def screen(
+    universe: Universe,
+    filters: List[tuple[str, str, float]],
+    sort: str = "gap_pct",
+    descending: bool = True,
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    """Apply all filters as one boolean mask and return the sorted top-N rows."""
+    if not len(universe):
+        return []
+
+    cols = universe.columns()
+    mask = np.ones(len(universe), dtype=bool)
+    for field, op, value in filters:
+        # NaN compares False, so symbols missing a field drop out of that filter
+        mask &= OPERATORS[op](cols[field], value)
+
+    candidates = np.flatnonzero(mask & ~np.isnan(cols[sort]))
+    if not candidates.size:
+        return []
+
+    keys = cols[sort][candidates]
+    if descending:
+        keys = -keys
+    if candidates.size > limit:
+        top = np.argpartition(keys, limit - 1)[:limit]
+        candidates, keys = candidates[top], keys[top]
+    ordered = candidates[np.argsort(keys, kind="stable")]
+
+    results = []
+    for i in ordered:
+        row: Dict[str, Any] = {"ticker": universe.symbols[i]}
+        for field in FIELDS:
+            value = cols[field][i]
+            row[field] = None if np.isnan(value) else round(float(value), 4)
+        risk = cols["risk"][i]
+        row["risk"] = "Unknown" if np.isnan(risk) else RISK_NAMES[int(risk)]
+        results.append(row)
+    return results
+
+
+UNIVERSE = Universe()
+
+
+# ------------------------------------------------------------
+# Incremental refresh
+# ------------------------------------------------------------
+class RateLimiter:
+    """Spaces calls evenly so a provider sees at most `per_minute` requests."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute
+        self.next_at = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        delay = self.next_at - now
+        self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+FINNHUB_LIMIT = RateLimiter(FINNHUB_RATE_PER_MINUTE)
+SEC_LIMIT = RateLimiter(SEC_RATE_PER_MINUTE)
+
+
+async def refresh_quotes(symbols: List[str]) -> None:
+    """Cheap pass: one quote call per symbol, written back as a single batch."""
+    from enrich import finnhub_quote
+
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def fetch(symbol: str):
+        async with sem:
+            await FINNHUB_LIMIT.wait()
+            return await finnhub_quote(symbol)
+
+    quotes = await asyncio.gather(*(fetch(s) for s in symbols), return_exceptions=True)
+    # Failed calls (including 429s) come back as all zeros from enrich's
+    # HTTP helper; skip them so the last good quote stays in place
+    ok = [
+        (s, q) for s, q in zip(symbols, quotes)
+        if not isinstance(q, Exception) and q[0] and q[1]
+    ]
+    if not ok:
+        return
+
+    arr = np.array([(q[0], q[1]) for _, q in ok], dtype=float)
+    volume = np.full(len(ok), np.nan)
+    UNIVERSE.update_quotes([s for s, _ in ok], arr[:, 0], arr[:, 1], volume)
+
+
+async def fetch_metrics(symbol: str) -> Dict[str, Any] | None:
+    """Profile, metrics and filings only; None when Finnhub returned nothing.
+
+    Skips the quote and company-news calls enrich_ticker makes, which the
+    screener doesn't use.
+    """
+    from enrich import calc_dilution_metrics, finnhub_metrics, finnhub_profile, sec_filings
+
+    async def finnhub(call):
+        await FINNHUB_LIMIT.wait()
+        return await call(symbol)
+
+    async def sec():
+        await SEC_LIMIT.wait()
+        return await sec_filings(symbol)
+
+    profile, metrics, filings = await asyncio.gather(
+        finnhub(finnhub_profile), finnhub(finnhub_metrics), sec()
+    )
+    if not profile or not metrics:
+        return None
+
+    float_shares = float(profile.get("shareOutstanding", 0.0) or 0.0)
+    risk, _, dilution_pct = calc_dilution_metrics(filings, float_shares)
+    return {
+        "float_shares": float_shares,
+        "market_cap": profile.get("marketCapitalization"),
+        "avg_volume_10d": metrics.get("10DayAverageTradingVolume"),
+        "dilution_pct_float": round(dilution_pct * 100, 2) if dilution_pct else None,
+        "risk": risk,
+    }
+
+
+async def refresh_metrics(symbols: List[str]) -> None:
+    """Expensive pass, only for symbols whose metrics are stale."""
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def fetch(symbol: str):
+        async with sem:
+            return await fetch_metrics(symbol)
+
+    results = await asyncio.gather(*(fetch(s) for s in symbols), return_exceptions=True)
+    failed = []
+    for symbol, res in zip(symbols, results):
+        if isinstance(res, Exception) or res is None:
+            if isinstance(res, Exception):
+                print(f"Screener metrics refresh failed for {symbol}: {res}")
+            failed.append(symbol)
+            continue
+        UNIVERSE.update_metrics(symbol, res)
+
+    if failed:
+        UNIVERSE.metrics_failed(failed)
+
+
+async def _quote_loop(symbols: List[str]) -> None:
+    while True:
+        started = time.monotonic()
+        try:
+            await refresh_quotes(symbols)
+        except Exception as e:
+            print(f"Screener quote refresh failed: {e}")
+        UNIVERSE.loaded = True
+        elapsed = time.monotonic() - started
+        await asyncio.sleep(max(QUOTE_REFRESH_SECONDS - elapsed, 0))
+
+
+async def _metrics_loop() -> None:
+    while True:
+        batch = UNIVERSE.stale_metrics(limit=METRICS_BATCH_SIZE)
+        if not batch:
+            await asyncio.sleep(QUOTE_REFRESH_SECONDS)
+            continue
+        try:
+            await refresh_metrics(batch)
+        except Exception as e:
+            print(f"Screener metrics refresh failed: {e}")
+            UNIVERSE.metrics_failed(batch)
+
+
+async def run_refresh_loop(symbols: List[str]) -> None:
+    """Keep the universe current: quotes every cycle, metrics in bounded
+    batches on their own task so a large enrichment pass never stalls quotes."""
+    UNIVERSE.rows(symbols)
+    await asyncio.gather(_quote_loop(symbols), _metrics_loop())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test script for the screener universe (no server or API keys needed)
+Run with: python test_screener.py
+"""
+import asyncio
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+import numpy as np
+
+import enrich
+import universe
+from universe import Universe, parse_filters, screen
+
+FAILURES = []
+
+def check(label, passed):
+    print(f"   {'✅' if passed else '❌'} {label}")
+    if not passed:
+        FAILURES.append(label)
+    return passed
+
+def raises(fn, *args):
+    try:
+        fn(*args)
+    except ValueError:
+        return True
+    return False
+
+def make_universe(rows):
+    """rows: (symbol, price, prev_close, metrics-dict-or-None)"""
+    u = Universe(capacity=4)
+    u.update_quotes(
+        [r[0] for r in rows],
+        np.array([r[1] for r in rows], dtype=float),
+        np.array([r[2] for r in rows], dtype=float),
+        np.full(len(rows), np.nan),
+    )
+    for symbol, _, _, metrics in rows:
+        if metrics is not None:
+            u.update_metrics(symbol, metrics)
+    return u
+
+def tickers(results):
+    return [r["ticker"] for r in results]
+
+def test_parse_filters():
+    print("\n1. Parsing filter expressions...")
+    clauses = parse_filters("gap_pct>=5, price<20,float_shares<=10,market_cap>1,risk!=High,price==3")
+    check("two-char operators win over one-char", clauses[0] == ("gap_pct", ">=", 5.0))
+    check("spaces and one-char operators", clauses[1] == ("price", "<", 20.0))
+    check("risk level maps to its code", clauses[4] == ("risk", "!=", 3.0))
+    check("== parses", clauses[5] == ("price", "==", 3.0))
+    check("empty expression means no filters", parse_filters("") == [])
+    check("unknown field rejected", raises(parse_filters, "foo>1"))
+    check("missing operator rejected", raises(parse_filters, "gap_pct5"))
+    check("bad number rejected", raises(parse_filters, "gap_pct>abc"))
+    check("Unknown risk is not filterable", raises(parse_filters, "risk==Unknown"))
+    check("rel_volume rejected until a volume source exists", raises(parse_filters, "rel_volume>=2"))
+    check("volume rejected until a volume source exists", raises(parse_filters, "volume>0"))
+
+def test_missing_data():
+    print("\n2. Storing missing metrics as NaN...")
+    u = make_universe([
+        # Profile lookup returned nothing: zeros and Unknown
+        ("NODATA", 12.0, 10.0, {"float_shares": 0.0, "market_cap": 0, "risk": "Unknown",
+                                "dilution_pct_float": None, "avg_volume_10d": None}),
+        # Known float, no dilution: None means 0%
+        ("CLEAN", 11.0, 10.0, {"float_shares": 5.0, "market_cap": 50, "risk": "Low",
+                               "dilution_pct_float": None, "avg_volume_10d": 1.0}),
+        ("DILUTE", 13.0, 10.0, {"float_shares": 8.0, "market_cap": 80, "risk": "High",
+                                "dilution_pct_float": 60.0, "avg_volume_10d": 1.0}),
+        ("NOMETRICS", 14.0, 10.0, None),
+    ])
+    cols = u.columns()
+    row = u.index["NODATA"]
+    check("zero float stored as NaN", math.isnan(cols["float_shares"][row]))
+    check("zero market cap stored as NaN", math.isnan(cols["market_cap"][row]))
+    check("Unknown risk stored as NaN", math.isnan(cols["risk"][row]))
+    check("None dilution with known float is 0%", cols["dilution_pct_float"][u.index["CLEAN"]] == 0.0)
+    check("None dilution with unknown float stays NaN", math.isnan(cols["dilution_pct_float"][row]))
+
+    result = tickers(screen(u, parse_filters("float_shares<=20,risk<=Medium")))
+    check("symbols without data excluded from float/risk filters", result == ["CLEAN"])
+    result = tickers(screen(u, parse_filters("dilution_pct_float<=10")))
+    check("0% dilution passes dilution filter", result == ["CLEAN"])
+    result = tickers(screen(u, []))
+    check("no filters returns every symbol by gap", result == ["NOMETRICS", "DILUTE", "NODATA", "CLEAN"])
+    nodata = next(r for r in screen(u, []) if r["ticker"] == "NODATA")
+    check("NaN fields serialize as null / Unknown", nodata["float_shares"] is None and nodata["risk"] == "Unknown")
+
+def test_risk_ordering():
+    print("\n3. Ordering risk levels...")
+    metrics = lambda risk: {"float_shares": 5.0, "risk": risk}
+    u = make_universe([
+        ("LOW", 11.0, 10.0, metrics("Low")),
+        ("MED", 12.0, 10.0, metrics("Medium")),
+        ("HIGH", 13.0, 10.0, metrics("High")),
+    ])
+    check("risk<=Medium keeps Low and Medium", tickers(screen(u, parse_filters("risk<=Medium"))) == ["MED", "LOW"])
+    check("risk>Low keeps Medium and High", tickers(screen(u, parse_filters("risk>Low"))) == ["HIGH", "MED"])
+    check("sort by risk ascending", tickers(screen(u, [], sort="risk", descending=False)) == ["LOW", "MED", "HIGH"])
+
+def test_top_n():
+    print("\n4. Selecting the top N...")
+    rng = np.random.default_rng(0)
+    n = 1000
+    symbols = [f"S{i}" for i in range(n)]
+    prev = rng.uniform(1, 50, n)
+    price = prev * rng.uniform(0.5, 2.0, n)
+    u = Universe(capacity=8)
+    u.update_quotes(symbols, price, prev, np.full(n, np.nan))
+    check("arrays grow past initial capacity", len(u) == n and len(u.data["price"]) >= n)
+    check("existing rows keep their values after growth", u.columns()["price"][0] == price[0])
+    check("re-adding a symbol reuses its row", u.rows(["S0"])[0] == 0 and len(u) == n)
+
+    gaps = (price - prev) / prev * 100
+    expected = [symbols[i] for i in np.argsort(-gaps)[:10]]
+    check("top 10 by gap, descending", tickers(screen(u, [], limit=10)) == expected)
+    expected = [symbols[i] for i in np.argsort(price)[:5]]
+    check("top 5 by price, ascending", tickers(screen(u, [], sort="price", descending=False, limit=5)) == expected)
+    check("limit larger than matches returns all", len(screen(u, parse_filters("gap_pct>90"), limit=500)) == int((gaps > 90).sum()))
+    check("no matches returns empty", screen(u, parse_filters("price<0")) == [])
+
+def test_refresh_failures():
+    print("\n5. Handling failed upstream calls...")
+    universe.FINNHUB_LIMIT = universe.RateLimiter(1e9)
+    universe.SEC_LIMIT = universe.RateLimiter(1e9)
+    u = universe.UNIVERSE = Universe()
+
+    async def good_quote(symbol):
+        return (12.0, 10.0, 12.0, 12.0, 12.0, 20.0, 0.0)
+
+    async def failed_quote(symbol):
+        # What enrich's HTTP helper yields on a 429 or network error
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    enrich.finnhub_quote = good_quote
+    asyncio.run(universe.refresh_quotes(["AAA"]))
+    enrich.finnhub_quote = failed_quote
+    asyncio.run(universe.refresh_quotes(["AAA"]))
+    check("failed quote keeps last good price", u.columns()["price"][u.index["AAA"]] == 12.0)
+
+    async def empty(symbol):
+        return {}
+
+    async def no_filings(symbol):
+        return []
+
+    enrich.finnhub_profile = empty
+    enrich.finnhub_metrics = empty
+    enrich.sec_filings = no_filings
+    asyncio.run(universe.refresh_metrics(["AAA"]))
+    check("empty profile/metrics is not stored as data", math.isnan(u.columns()["risk"][u.index["AAA"]]))
+    check("empty profile/metrics backs off, not a full TTL",
+          u.stale_metrics() == [] and
+          u.stale_metrics(ttl=universe.METRICS_TTL_SECONDS - universe.METRICS_RETRY_SECONDS - 1) == ["AAA"])
+
+    async def profile(symbol):
+        return {"shareOutstanding": 5.0, "marketCapitalization": 50.0}
+
+    async def metrics(symbol):
+        return {"10DayAverageTradingVolume": 1.5}
+
+    enrich.finnhub_profile = profile
+    enrich.finnhub_metrics = metrics
+    asyncio.run(universe.refresh_metrics(["AAA"]))
+    cols = u.columns()
+    row = u.index["AAA"]
+    check("successful metrics stored", cols["float_shares"][row] == 5.0 and cols["risk"][row] == 1.0)
+
+if __name__ == "__main__":
+    print("🧪 Testing screener universe...")
+    test_parse_filters()
+    test_missing_data()
+    test_risk_ordering()
+    test_top_n()
+    test_refresh_failures()
+    if FAILURES:
+        print(f"\n❌ {len(FAILURES)} check(s) failed")
+        sys.exit(1)
+    print("\n🎉 All tests completed!")
@@ -123,9 +123,91 @@ def test_trades_api():
     else:
         print(f"❌ Failed to get updated stats: {response.status_code}")
 
+def get_rollup(dimension, key):
+    """Return the /trades/stats/by-<dimension> row for key, or None"""
+    response = requests.get(f"{BASE_URL}/trades/stats/by-{dimension}")
+    if response.status_code != 200:
+        print(f"❌ Failed to get by-{dimension} stats: {response.status_code}")
+        return None
+    return next((r for r in response.json() if r['key'] == key), None)
+
+def check(label, passed):
+    print(f"   {'✅' if passed else '❌'} {label}")
+    return passed
+
+def test_rollups_api():
+    print("\n🧪 Testing tag/setup/symbol/day rollups...")
+
+    # Test 1: Create a dated, tagged trade (duplicate/padded tags count once)
+    print("\n1. Creating a dated, tagged trade...")
+    trade_data = {
+        "symbol": "RLUP",
+        "side": "LONG",
+        "quantity": 100,
+        "entry_price": 10.00,
+        "exit_price": 12.00,
+        "commission": 0.00,
+        "setup": "Rollup check",
+        "stop_loss": 9.00,
+        "date": "2026-01-05",
+        "tags": ["rollup-a", "rollup-a", " rollup-b ", ""]
+    }
+    response = requests.post(f"{BASE_URL}/trades/", json=trade_data)
+    if response.status_code != 200:
+        print(f"❌ Failed to create dated trade: {response.status_code}")
+        print(response.text)
+        return
+    trade = response.json()
+    trade_id = trade['id']
+    check("date round-trips", trade['date'] == "2026-01-05")
+
+    tag_a = get_rollup("tag", "rollup-a")
+    check("by-tag counts duplicate tag once", tag_a is not None and tag_a['trade_count'] == 1)
+    check("by-tag strips padded tag", get_rollup("tag", "rollup-b") is not None)
+    check("by-tag ignores blank tag", get_rollup("tag", "") is None)
+    check("by-tag average R is 2.0", tag_a is not None and tag_a['avg_r'] == 2.0)
+    setup = get_rollup("setup", "Rollup check")
+    check("by-setup includes trade", setup is not None and setup['total_pnl'] == 200.0)
+    check("by-symbol includes trade", get_rollup("symbol", "RLUP") is not None)
+    check("by-day includes trade", get_rollup("day", "2026-01-05") is not None)
+
+    # Test 2: Update moves the trade between rollups
+    print(f"\n2. Updating trade {trade_id}...")
+    update_data = {
+        **trade_data,
+        "symbol": "RLUP2",
+        "exit_price": 9.50,
+        "tags": ["rollup-b"]
+    }
+    response = requests.put(f"{BASE_URL}/trades/{trade_id}", json=update_data)
+    if not check("PUT succeeds", response.status_code == 200):
+        print(response.text)
+        return
+    trade = requests.get(f"{BASE_URL}/trades/{trade_id}").json()
+    check("GET returns updated trade", trade['symbol'] == "RLUP2" and trade['net_pnl'] == -50.0)
+    check("date survives update", trade['date'] == "2026-01-05")
+
+    check("by-tag drops removed tag", get_rollup("tag", "rollup-a") is None)
+    tag_b = get_rollup("tag", "rollup-b")
+    check("by-tag reflects new P&L", tag_b is not None and tag_b['total_pnl'] == -50.0
+          and tag_b['losing_trades'] == 1 and tag_b['winning_trades'] == 0)
+    check("by-symbol drops old symbol", get_rollup("symbol", "RLUP") is None)
+    check("by-symbol adds new symbol", get_rollup("symbol", "RLUP2") is not None)
+    setup = get_rollup("setup", "Rollup check")
+    check("by-setup reflects new P&L", setup is not None and setup['total_pnl'] == -50.0)
+
+    # Test 3: Delete removes the trade from every rollup
+    print(f"\n3. Deleting trade {trade_id}...")
+    response = requests.delete(f"{BASE_URL}/trades/{trade_id}")
+    check("DELETE succeeds", response.status_code == 200)
+    check("by-tag emptied", get_rollup("tag", "rollup-b") is None)
+    check("by-setup emptied", get_rollup("setup", "Rollup check") is None)
+    check("by-symbol emptied", get_rollup("symbol", "RLUP2") is None)
+    check("by-day emptied", get_rollup("day", "2026-01-05") is None)
+
 def test_health_check():
     print("🏥 Testing health check...")
-    response = requests.get(f"{BASE_URL}/ping")
+    response = requests.get(f"{BASE_URL}/health")
     if response.status_code == 200:
         print("✅ Backend is healthy!")
     else:
@@ -135,6 +217,7 @@ if __name__ == "__main__":
     try:
         test_health_check()
         test_trades_api()
+        test_rollups_api()
         print("\n🎉 All tests completed!")
     except requests.exceptions.ConnectionError:
         print("❌ Could not connect to backend. Make sure it's running on http://localhost:8000")